@@ -15,3 +15,18 @@ import sys
 __all__ = ["make", "sources"]
 
 BITNESS = struct.calcsize("P") * 8
+
+SYSTEM = platform.system()
+
+def effective_cpu_count() -> int:
+    """The number of CPUs this process may actually run on
+
+    Unlike `os.cpu_count`, this respects CPU affinity, so a container limited
+    to a couple of cores does not report every core of its host
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
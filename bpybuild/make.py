@@ -5,29 +5,139 @@ Make Blender python modules binaries
 """
 
 # STD_LIB imports
+import functools
+import json
 import logging
 import os
 import pathlib
-import platform
+import re
+import shutil
 import subprocess
 import sys
 import typing
-from typing import Dict, List, Optional, Tuple
-
-# PYPI imports
-import cmakegenerators
+from typing import Dict, List, Optional, Set, Tuple
 
 # Relative imports
-from bpybuild import BITNESS
+from bpybuild import BITNESS, SYSTEM, effective_cpu_count
 
 LOGGER = logging.getLogger(__name__)
 
+VS_GENERATOR_REGEX = re.compile(r"Visual Studio (\d+)")
+
+# Features headless scripting with `bpy` can live without, and which make up a
+# large share of the compile and link time
+MINIMAL_CONFIGURE_ARGS = ("-DWITH_CYCLES=OFF", "-DWITH_OPENCOLORIO=OFF",
+                          "-DWITH_OPENIMAGEDENOISE=OFF", "-DWITH_OPENVDB=OFF",
+                          "-DWITH_OPENSUBDIV=OFF", "-DWITH_USD=OFF",
+                          "-DWITH_ALEMBIC=OFF", "-DWITH_CODEC_FFMPEG=OFF",
+                          "-DWITH_BULLET=OFF")
+
+@functools.lru_cache()
+def _installed_vs_versions() -> Optional[Set[int]]:
+    """The major versions of Visual Studio with C++ tools that are installed
+
+    Asks `vswhere`, which ships with Visual Studio 2017 and newer; `None` when
+    it is not there to ask or gives no usable answer
+    """
+
+    vswhere = os.path.join(os.environ.get("ProgramFiles(x86)",
+                                          r"C:\Program Files (x86)"),
+                           "Microsoft Visual Studio", "Installer", "vswhere.exe")
+
+    if not os.path.isfile(vswhere):
+
+        return None
+
+    try:
+
+        result = subprocess.run(
+            [vswhere, "-products", "*", "-requires",
+             "Microsoft.VisualStudio.Component.VC.Tools.x86.x64",
+             "-format", "json", "-utf8"], stdout=subprocess.PIPE)
+
+        installs = json.loads(result.stdout.decode("utf-8"))
+
+    except (OSError, ValueError):
+
+        LOGGER.info("Could not ask vswhere for installed Visual Studio "
+                    "versions")
+
+        return None
+
+    return {int(install["installationVersion"].split(".")[0]) for install in
+            installs if "installationVersion" in install}
+
+@functools.lru_cache()
+def _vs_generators() -> tuple:
+    """The Visual Studio generators to choose from, scanned only once
+
+    Narrowed down to the installed versions when those are known
+    """
+
+    # Only needed on Windows, so not imported with the module
+    import cmakegenerators
+
+    generators = tuple(generator for generator in 
+                       cmakegenerators.get_generators() if 
+                       generator.name.startswith("Visual Studio"))
+
+    installed_versions = _installed_vs_versions()
+
+    if installed_versions is None:
+
+        return generators
+
+    installed_generators = tuple(generator for generator in generators if 
+                                 int(VS_GENERATOR_REGEX.match(generator.name)
+                                     .group(1)) in installed_versions)
+
+    # `vswhere` does not report Visual Studio 2015 and older
+    return installed_generators if installed_generators else generators
+
+@functools.lru_cache()
+def _vs_generator_options() -> Dict[int, Optional[str]]:
+    """The Visual Studio generator option to configure with, keyed by bitness
+
+    Empty when Visual Studio is not installed
+    """
+
+    generators = _vs_generators()
+
+    if not generators:
+
+        return {}
+
+    newest_options = generators[0].options
+
+    options_64 = [option for generator in generators for option in 
+                  generator.options if "64" in option]
+
+    return {64: options_64[0] if options_64 else 
+                (newest_options[0] if newest_options else None),
+            32: newest_options[-1] if newest_options else None}
+
+@functools.lru_cache()
+def _compiler_launcher() -> Optional[str]:
+    """The compiler cache on `PATH` to wrap compiler calls with, if any
+    """
+
+    for launcher in ["ccache", "sccache"]:
+
+        if shutil.which(launcher) is not None:
+
+            return launcher
+
+    return None
+
 def get_configure_commands(source: pathlib.Path, destination: pathlib.Path,
                            bitness: Optional[int] = None,
-                           cmake_configure_args: Optional[List[str]] = None) -> List[List[str]]:
-
-    cmake_configure_args = cmake_configure_args if \
-                           cmake_configure_args is not None else []
+                           cmake_configure_args: Optional[List[str]] = None,
+                           use_compiler_cache: Optional[bool] = True,
+                           minimal: Optional[bool] = False,
+                           is_release: Optional[bool] = True,
+                           native: Optional[bool] = False,
+                           use_ninja: Optional[bool] = False,
+                           ipo: Optional[bool] = False) -> List[List[str]]:
 
     commands = []
 
@@ -35,83 +145,110 @@ def get_configure_commands(source: pathlib.Path, destination: pathlib.Path,
 
     if bitness is None: bitness = BITNESS
 
-    if platform.system() == "Windows":
+    # Resolved once so cmake always sees the same canonical paths
+    source_path = str(source.resolve())
+    destination_path = str(destination.resolve())
+
+    if SYSTEM == "Windows":
 
         os_configure_args += ["-DWITH_WINDOWS_BUNDLE_CRT=OFF"]
 
-        generators = [generator for generator in 
-                      cmakegenerators.get_generators() if 
-                      generator.name.startswith("Visual Studio")]
+        generator_options = _vs_generator_options()
 
-        if len(generators) == 0:
+        if not generator_options:
 
             raise Exception("Windows users must have Visual Studio")
 
-        filtered_generators = [generator for generator in generators if 
-                               "Visual Studio".casefold() in 
-                               generator.name.casefold()]
+        generator_option = generator_options[64 if bitness == 64 else 32]
 
-        if len(filtered_generators) > 0:
+        if generator_option is None:
 
-            generator_option = None
+            raise Exception(f"No C++ compilers detected on Windows {bitness}bit")
 
-            if bitness == 64:
+        os_configure_args += ["-G", generator_option]
 
-                filtered_generator_options = [option for generator in 
-                                              filtered_generators for option in
-                                              generator.options if 
-                                              "64".casefold() in option.casefold()]
+    elif SYSTEM == "Darwin":
 
-                if len(filtered_generator_options) > 0:
+        os_configure_args += ["-DWITH_OPENMP=OFF", "-DWITH_AUDASPACE=OFF"]
 
-                    generator_option = filtered_generator_options[0]
+    # Opt-in: an existing build tree cannot switch generators
+    if use_ninja and SYSTEM != "Windows":
 
-                else:
+        os_configure_args += ["-G", "Ninja"]
 
-                    generator_option = filtered_generators[0].options[0]
+    configure_args = ["cmake", "-DWITH_PYTHON_INSTALL=OFF",
+                      "-DWITH_PYTHON_MODULE=ON"]
 
-            else:
+    # Single-config generators pick the build type here, not at build time
+    configure_args += ["-DCMAKE_BUILD_TYPE=" + 
+                       ("Release" if is_release else "Debug")]
 
-                generator_option = filtered_generators[0].options[-1]
+    if ipo:
 
-            if generator_option is None:
+        configure_args += ["-DCMAKE_INTERPROCEDURAL_OPTIMIZATION=ON"]
 
-                raise Exception(f"No C++ compilers detected on Windows {BITNESS}bit")
+    if native and SYSTEM != "Windows":
 
-            os_configure_args += ["-G", generator_option]
+        # Only for modules that stay on the machine that built them. Set as
+        # the *_INIT flags, which cmake adds to any exported CFLAGS/CXXFLAGS
+        # when it first configures the tree
+        configure_args += ["-DCMAKE_C_FLAGS_INIT=-march=native",
+                           "-DCMAKE_CXX_FLAGS_INIT=-march=native"]
 
-        else:
+    compiler_launcher = _compiler_launcher() if use_compiler_cache else None
 
-            raise Exception(f"Visual Studio not found")
+    if compiler_launcher is not None:
 
-    elif platform.system() == "Darwin":
+        # Ahead of `cmake_configure_args`, so callers can still override it
+        configure_args += [f"-DCMAKE_C_COMPILER_LAUNCHER={compiler_launcher}",
+                           f"-DCMAKE_CXX_COMPILER_LAUNCHER={compiler_launcher}",
+                           f"-DCMAKE_CUDA_COMPILER_LAUNCHER={compiler_launcher}"]
 
-        os_configure_args += ["-DWITH_OPENMP=OFF", "-DWITH_AUDASPACE=OFF"]
+    if minimal:
+
+        configure_args.extend(MINIMAL_CONFIGURE_ARGS)
 
-    commands.append(['cmake', "-DWITH_PYTHON_INSTALL=OFF", "-DWITH_PYTHON_MODULE=ON"] + cmake_configure_args + os_configure_args + 
-                    ['-S' + str(source.absolute()), 
-                     '-B' + str(destination.absolute())])
+    configure_args.extend(cmake_configure_args or ())
+    configure_args.extend(os_configure_args)
+    configure_args += ["-S" + source_path, "-B" + destination_path]
+
+    commands.append(configure_args)
 
     return commands
 
 def get_build_commands(location: pathlib.Path,
-                       is_release: Optional[bool] = True) -> List[List[str]]:
+                       is_release: Optional[bool] = True,
+                       jobs: Optional[int] = None,
+                       use_ninja: Optional[bool] = False) -> List[List[str]]:
 
     commands = []
 
     os_build_args = []
 
-    if platform.system() == "Windows": # Windows specific build requirements
+    jobs = jobs if jobs else effective_cpu_count()
+
+    location_path = str(location.resolve())
+
+    if SYSTEM == "Windows": # Windows specific build requirements
 
         os_build_args += ["--target", "INSTALL", "--config", 
-                          f"{'Release' if is_release else 'Debug'}"]
+                          f"{'Release' if is_release else 'Debug'}",
+                          "--parallel", str(jobs),
+                          # Let MSBuild share the job count across projects
+                          # and not leave build nodes running afterwards
+                          "--", "/nodeReuse:false", "/p:UseMultiToolTask=true",
+                          "/p:EnforceProcessCountAcrossBuilds=true"]
+
+        commands.append(["cmake", "--build", location_path] + os_build_args)
+
+    elif use_ninja:
 
-        commands.append(["cmake", "--build", 
-                        str(location.absolute())] + os_build_args)
+        commands.append(["cmake", "--build", location_path,
+                         "--target", "install", "--parallel", str(jobs)])
 
     else:
 
-        commands.append(["make", "-C", str(location.absolute()), "install"])
+        commands.append(["make", "-C", location_path, f"-j{jobs}", "install"])
 
     return commands
 
@@ -119,10 +256,21 @@ def get_make_commands(source_location: pathlib.Path,
                       build_location: Optional[pathlib.Path] = None,
                       bitness: Optional[int] = BITNESS,
                       cmake_configure_args: Optional[List[str]] = None,
-                      is_release: Optional[bool] = True) -> List[List[str]]:
+                      is_release: Optional[bool] = True,
+                      jobs: Optional[int] = None,
+                      use_compiler_cache: Optional[bool] = True,
+                      minimal: Optional[bool] = False,
+                      native: Optional[bool] = False,
+                      use_ninja: Optional[bool] = False,
+                      ipo: Optional[bool] = False) -> List[List[str]]:
 
     build_location = build_location if build_location else source_location
 
     return get_configure_commands(source_location, build_location, 
-                                  bitness, cmake_configure_args) +\
-           get_build_commands(build_location, is_release)
+                                  bitness, cmake_configure_args,
+                                  use_compiler_cache=use_compiler_cache,
+                                  minimal=minimal, is_release=is_release,
+                                  native=native, use_ninja=use_ninja,
+                                  ipo=ipo) +\
+           get_build_commands(build_location, is_release=is_release,
+                              jobs=jobs, use_ninja=use_ninja)
@@ -5,49 +5,175 @@
 
 # STD_LIB imports
 import abc
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import json
 import logging
 import os
 import pkg_resources
 import pathlib
-import platform
 import posixpath
 import re
+import subprocess
 import sys
+import time
 import typing
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # PYPI imports
-import git
-from git import Repo as GitRepo
-from git.exc import NoSuchPathError
 from svn.exception import SvnException
 from svn.remote import RemoteClient as SvnRepo
 
 # Relative imports
-from bpybuild import BITNESS
+from bpybuild import BITNESS, SYSTEM, effective_cpu_count
 
 LOGGER = logging.getLogger(__name__)
 
-# Platform-specific PYPI imports
-try:
-    import distro
-except ImportError as e:
-    # Only raise the error if it's Linux environment
-    if platform.system == "Linux":
-        LOGGER.info("Package `distro` not available")
-        raise e
+# `svn` queries are network bound, so this is not tied to the CPU count
+SVN_WORKERS = 16
 
+# Whole-version checkouts are heavy on both network and disk
+CHECKOUT_WORKERS = min(8, effective_cpu_count())
+
+def default_cache_dir() -> Optional[pathlib.Path]:
+    """Where answers from remote servers are kept between runs
+
+    The platform's user cache directory, unless `BPYBUILD_CACHE_DIR` says
+    otherwise; setting that to an empty string turns the disk cache off
+
+    Returns:
+        Optional[pathlib.Path] -- the cache directory, `None` when disabled
+    """
+
+    if "BPYBUILD_CACHE_DIR" in os.environ:
+
+        override = os.environ["BPYBUILD_CACHE_DIR"]
+
+        return pathlib.Path(override) if override else None
+
+    if SYSTEM == "Windows":
+
+        base = os.environ.get("LOCALAPPDATA") or \
+               str(pathlib.Path.home() / "AppData" / "Local")
+
+    elif SYSTEM == "Darwin":
+
+        base = str(pathlib.Path.home() / "Library" / "Caches")
+
+    else:
+
+        base = os.environ.get("XDG_CACHE_HOME") or \
+               str(pathlib.Path.home() / ".cache")
+
+    return pathlib.Path(base) / "bpybuild"
+
+# `None` keeps everything in memory
+CACHE_DIR = default_cache_dir()
+
+# Remote tags are looked up again once the cached list is older than this
+GIT_TAGS_CACHE_SECONDS = 60 * 60
+
+# Directories under an `svn` tag's "lib" that are, or are not, per platform
+NON_PLATFORM_LIB_DIRS = frozenset(["benchmarks", "package", "python", "tests"])
+PLATFORM_LIB_DIR_PREFIXES = ("android", "darwin", "linux", "win")
+
+def run_git(*args: str) -> str:
+    """Run `git` with `args`, returning what it wrote to stdout
+
+    Raises:
+        subprocess.CalledProcessError -- when `git` exits unsuccessfully
+    """
+
+    return subprocess.run(("git",) + args, check=True, stdout=subprocess.PIPE,
+                          universal_newlines=True).stdout
+
+def read_cache(cache_path: pathlib.Path, max_age: Optional[float] = None):
+    """Load what `write_cache` stored at `cache_path`
+
+    Arguments:
+        cache_path {pathlib.Path} -- the cache file
+
+    Keyword Arguments:
+        max_age {Optional[float]} -- seconds after which the cache is stale,
+                                     or `None` if it never is 
+                                     (default: {None})
+
+    Returns:
+        The cached data, or `None` when it is missing, stale or unreadable
+    """
+
+    try:
+
+        if max_age is not None and \
+           time.time() - cache_path.stat().st_mtime > max_age:
+
+            return None
+
+        with open(str(cache_path), "r") as cache_file:
+
+            return json.load(cache_file)
+
+    except (OSError, ValueError):
+
+        return None
+
+def write_cache(cache_path: pathlib.Path, data):
+    """Store `data` as JSON at `cache_path`; failing to do so is not an error
+
+    Arguments:
+        cache_path {pathlib.Path} -- the cache file
+        data -- anything `json` can serialize
+    """
+
+    try:
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(str(cache_path), "w") as cache_file:
+
+            json.dump(data, cache_file)
+
+    except OSError:
+
+        LOGGER.info("Could not write cache %s", cache_path)
+
+@functools.lru_cache(maxsize=32)
 def git_remote_tags(url:str) -> List[Tuple[str, str]]:
     """Get the tags of a remote repository from the repo's `url`
+
+    Remembered per `url` for the life of the process, and in `CACHE_DIR` for
+    `GIT_TAGS_CACHE_SECONDS`; do not modify the returned list
     
     Arguments:
         url {str} -- The repo's address
     """
 
-    return [(tag.split("\t")[0], tag.split("\t")[1]) for tag in 
-             git.cmd.Git().ls_remote(url, tags=True).split("\n") if 
-             not tag.endswith(r"^{}")]
+    cache_path = None
+
+    if CACHE_DIR is not None:
+
+        cache_path = CACHE_DIR / "git_remote_tags" / (
+            hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+        cached_tags = read_cache(cache_path, max_age=GIT_TAGS_CACHE_SECONDS)
 
+        if cached_tags is not None:
+
+            return [tuple(tag) for tag in cached_tags]
+
+    tags = [(tag.split("\t")[0], tag.split("\t")[1]) for tag in 
+            run_git("ls-remote", "--tags", url).splitlines() if 
+            not tag.endswith(r"^{}")]
+
+    if cache_path is not None:
+
+        write_cache(cache_path, tags)
+
+    return tags
+
+@functools.lru_cache(maxsize=32)
 def git_remote_tagnames(url:str) -> List[str]:
     """Get a list of just names of tags in the remote
     
@@ -57,6 +183,19 @@ def git_remote_tagnames(url:str) -> List[str]:
 
     return [posixpath.basename(tag[1]) for tag in git_remote_tags(url)]
 
+@functools.lru_cache(maxsize=32)
+def svn_remote_tags(url: str) -> List[str]:
+    """Get the tags of a remote `svn` repository from the repo's `url`
+
+    Remembered per `url` for the life of the process; do not modify the
+    returned list
+
+    Arguments:
+        url {str} -- The repo's address
+    """
+
+    return list(SvnRepo(url).list(rel_path="/tags"))
+
 class VersionNotFoundError(Exception):
     """Thrown when `git` or `svn` does not have the specified tag
     
@@ -70,6 +209,8 @@ class SourceVersionControl(abc.ABC):
     """Represents code repositories that can be checked out
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def checkout(self, full_path:pathlib.Path):
         """Retrieves the code in an impliementation-specific way
@@ -81,14 +222,23 @@ class SourceVersionControl(abc.ABC):
 
 class SvnOSPlatform():
 
+    # One of these exists per platform per tag; keep them small
+    __slots__ = ("url", "_repo", "svn_name", "os_name", "os_version",
+                 "processor", "bitness", "build_environment")
+
     PYTHON_PATTERN = (r'(?<=python)(\d)(?:\.?)(\d)')
     PYTHON_REGEX = re.compile(PYTHON_PATTERN)
+    DARWIN_SPLIT_REGEX = re.compile(r"[\.-]")
+
+    # Casefolded `svn` directory name prefix, and the os it stands for
+    OS_PREFIXES = (("android", "Android"), ("darwin", "Darwin"),
+                   ("linux", "Linux"), ("win", "Windows"))
 
     def __init__(self, svn_url: str):
 
         self.url = svn_url
 
-        self.repo = SvnRepo(svn_url)
+        self._repo = None
 
         self.svn_name = posixpath.basename(svn_url)
 
@@ -98,58 +248,56 @@ class SvnOSPlatform():
         self.bitness = None
         self.build_environment = None
 
-        if self.svn_name.casefold().startswith("android".casefold()):
+        svn_name = self.svn_name.casefold()
 
-            self.os_name = "Android"
-        
-        elif self.svn_name.casefold().startswith("darwin".casefold()):
+        for prefix, os_name in self.OS_PREFIXES:
 
-            self.os_name = "Darwin"
+            if svn_name.startswith(prefix):
 
-            darwin_platform_tokens = re.split(r"[\.-]", self.svn_name)
+                self.os_name = os_name
 
-            if len(darwin_platform_tokens) >= 4:
+                break
 
-                self.os_version = pkg_resources.parse_version(".".join(darwin_platform_tokens[1: -1]))
-
-                self.processor = darwin_platform_tokens[-1]
+        if self.os_name == "Darwin":
 
-        elif self.svn_name.casefold().startswith("linux".casefold()):
+            darwin_platform_tokens = self.DARWIN_SPLIT_REGEX.split(self.svn_name)
 
-            self.os_name = "Linux"
+            if len(darwin_platform_tokens) >= 4:
 
-        elif self.svn_name.casefold().startswith("win".casefold()):
+                self.os_version = pkg_resources.parse_version(".".join(darwin_platform_tokens[1: -1]))
 
-            self.os_name = "Windows"
+                self.processor = darwin_platform_tokens[-1]
 
-            if "64".casefold() in self.svn_name.casefold():
+        elif self.os_name == "Windows":
 
-                self.bitness = 64
+            self.bitness = 64 if "64" in svn_name else 32
 
-            else:
+            if "vc" in svn_name:
 
-                self.bitness = 32
+                self.build_environment = "vc" + self.svn_name.split("vc")[-1]
 
-            if "vc".casefold() in self.svn_name.casefold():
+    @property
+    def repo(self) -> SvnRepo:
+        """The `svn` client for this platform, made the first time it is needed
+        """
 
-                self.build_environment = "vc" + self.svn_name.split("vc")[-1]
+        if self._repo is None:
 
-        else:
+            self._repo = SvnRepo(self.url)
 
-            self.os_name = None
+        return self._repo
 
     def python_versions(self) -> List[Tuple[int, int]]:
 
         try:
 
-            versions = [re.search(self.PYTHON_REGEX, 
-                                  version["name"]) for version in 
-                        self.repo.list(extended = True,
-                                       rel_path = "python/lib") if
-                        re.search(self.PYTHON_REGEX, version["name"]) and 
-                        version["kind"] == "file"]
+            matches = (self.PYTHON_REGEX.search(version["name"]) for version in
+                       self.repo.list(extended = True,
+                                      rel_path = "python/lib") if
+                       version["kind"] == "file")
 
-            return [(int(version.group(1)), int(version.group(2))) for version in versions]
+            return [(int(match.group(1)), int(match.group(2))) for match in 
+                    matches if match]
 
         except SvnException:
 
@@ -163,6 +311,8 @@ class BlenderGit(SourceVersionControl):
 
     BASE_URL = "git://git.blender.org/blender.git"
 
+    __slots__ = ("tag", "version")
+
     # Here I store the Blender `git` sources in a folder in the home directory
     # so that I don't need to waste time constantly pulling from the repository;
     # only minor updates are needed here and there.
@@ -184,46 +334,117 @@ class BlenderGit(SourceVersionControl):
         return [version for version in git_remote_tagnames(self.BASE_URL) if 
                 not str(version).startswith("Studio")] # what is a studio version?
 
-    def checkout(self, full_path: pathlib.Path):
+    def checkout(self, full_path: pathlib.Path, submodules: bool = True):
         """Retrieve Blender code from Git
         
         Keyword Arguments:
             full_path {pathlib.Path} -- place to clone code to 
+            submodules {bool} -- also retrieve the submodules, otherwise call
+                                 `checkout_submodules` later (default: {True})
         """
 
+        ref = self.tag if self.tag is not None else "master"
+
+        repo_path = str(full_path)
+
+        if not (pathlib.Path(full_path) / ".git").exists():
+
+            # Only the tip of `ref` is needed to build, not the full history
+            run_git("clone", "--depth=1", "--single-branch", f"--branch={ref}",
+                    self.BASE_URL, repo_path)
+
+        elif self.has_current_tag(full_path):
+
+            # The local tag matches the remote's, so no fetch is needed
+            if self.is_checked_out(full_path):
+
+                LOGGER.info("%s is already at %s", repo_path, self.tag)
+
+            else:
+
+                run_git("-C", repo_path, "reset", "--hard",
+                        f"refs/tags/{self.tag}")
+
+        else:
+
+            # Fetching a tag as `tag <name>` keeps a local ref for it, which
+            # `has_current_tag` relies on next time; `--force` replaces a
+            # local tag the remote has since moved
+            run_git("-C", repo_path, "fetch", "--force", "--depth=1", "origin",
+                    *(["tag", self.tag] if self.tag is not None else [ref]))
+            run_git("-C", repo_path, "reset", "--hard", "FETCH_HEAD")
+
+        if submodules:
+
+            self.checkout_submodules(full_path)
+
+    def is_checked_out(self, full_path: pathlib.Path) -> bool:
+        """Whether the clone at `full_path` is already at this tag
+
+        Always `False` when following `master`, which can move at any time
+
+        Arguments:
+            full_path {pathlib.Path} -- place the code was cloned to
+        """
+
+        if self.tag is None:
+
+            return False
+
+        repo_path = str(full_path)
+
         try:
 
-            repo = GitRepo(str(full_path))
+            return run_git("-C", repo_path, "rev-parse", "HEAD") == \
+                   run_git("-C", repo_path, "rev-parse", "--verify", "--quiet",
+                           f"refs/tags/{self.tag}^{{commit}}")
 
-        except:
+        except subprocess.CalledProcessError:
 
-            GitRepo.clone_from(self.BASE_URL, str(full_path))
-            repo = GitRepo(str(full_path))
-        
-        repo.heads.master.checkout()
-        repo.remotes.origin.pull()
+            return False
 
-        if self.tag is not None:
+    def has_current_tag(self, full_path: pathlib.Path) -> bool:
+        """Whether the clone at `full_path` has this tag as the remote has it
 
-            repo.git.checkout(self.tag)
+        Checking out such a tag needs no fetch; the remote's answer comes from
+        the cached `git_remote_tags`
 
-        repo.git.submodule('update', '--init', '--recursive')
+        Arguments:
+            full_path {pathlib.Path} -- place the code was cloned to
+        """
 
-        for submodule in repo.submodules:
+        if self.tag is None:
 
-            submodule_repo = submodule.module()
-            submodule_repo.heads.master.checkout()
-            submodule_repo.remotes.origin.pull()
+            return False
 
-            if self.tag is not None:
+        try:
 
-                try:
+            local_sha = run_git("-C", str(full_path), "rev-parse", "--verify",
+                                "--quiet", f"refs/tags/{self.tag}").strip()
 
-                    submodule_repo.git.checkout(self.tag)
+        except subprocess.CalledProcessError:
 
-                except:
+            return False
+
+        return (local_sha, f"refs/tags/{self.tag}") in \
+               git_remote_tags(self.BASE_URL)
+
+    def checkout_submodules(self, full_path: pathlib.Path):
+        """Retrieve the submodules of Blender code already cloned from Git
+
+        Arguments:
+            full_path {pathlib.Path} -- place the code was cloned to
+        """
 
-                    pass
+        # A tag pins the submodule commits released with it, which are rarely
+        # branch tips and so cannot be fetched shallowly from every server;
+        # `master` follows each submodule's own branch tip, which can be
+        # fetched with `--depth=1`
+        follow_remote = ["--remote", "--depth=1"] if self.tag is None else []
+
+        run_git("-C", str(full_path), "submodule", "update", "--init",
+                "--recursive", f"--jobs={effective_cpu_count()}",
+                *follow_remote)
 
 class BlenderSvn(SourceVersionControl):
     """The Blender `svn` library index
@@ -232,24 +453,51 @@ class BlenderSvn(SourceVersionControl):
     """
 
     BASE_URL = "https://svn.blender.org/svnroot/bf-blender"
-    BASE_REPO = SvnRepo(BASE_URL)
+
+    VERSION_CLEAN_REGEX = re.compile(r"blender-|-release|-winfix")
+
+    # Written into the exported "lib" directory, holding the tag it came from
+    EXPORT_MARKER = ".bpybuild-svn-export"
+
+    __slots__ = ("url", "_repo", "_version", "_platforms", "_platforms_dict")
 
     def __init__(self, svn_url: str):
 
         self.url = svn_url
 
-        self.repo = SvnRepo(svn_url)
+        self._repo = None
 
-        self.version = pkg_resources.parse_version(os.path.basename(os.path.normpath(svn_url))
-                                                   .replace("blender-", "")
-                                                   .replace("-release", "")
-                                                   .replace("-winfix", "")
-                                                   .replace("-", "."))
+        self._version = None
 
         self._platforms = None
 
         self._platforms_dict = None
 
+    @property
+    def repo(self) -> SvnRepo:
+        """The `svn` client for this tag, made the first time it is needed
+        """
+
+        if self._repo is None:
+
+            self._repo = SvnRepo(self.url)
+
+        return self._repo
+
+    @property
+    def version(self):
+        """The Blender version this tag holds the libraries for
+        """
+
+        if self._version is None:
+
+            tag_name = os.path.basename(os.path.normpath(self.url))
+
+            self._version = pkg_resources.parse_version(
+                self.VERSION_CLEAN_REGEX.sub("", tag_name).replace("-", "."))
+
+        return self._version
+
     @classmethod
     def tags(cls) -> List[str]:
         """The tags that `svn` found
@@ -262,7 +510,7 @@ class BlenderSvn(SourceVersionControl):
         """
 
         return [posixpath.join(cls.BASE_URL, "tags", _version) for _version in
-                cls.BASE_REPO.list(rel_path="/tags") if 
+                svn_remote_tags(cls.BASE_URL) if 
                 _version.startswith("blender")]
 
     def platforms(self) -> List[SvnOSPlatform]:
@@ -307,8 +555,7 @@ class BlenderSvn(SourceVersionControl):
 
             for _os in SvnRepo(url).list(extended = True, rel_path = "lib"):
 
-                if not any([_os["name"] == x for x in ["benchmarks", "package",
-                                                       "python", "tests"]]):
+                if _os["name"] not in NON_PLATFORM_LIB_DIRS:
 
                     results.append(SvnOSPlatform(posixpath.join(url + "lib", 
                                                  _os["name"])))
@@ -329,13 +576,13 @@ class BlenderSvn(SourceVersionControl):
             _oss = [SvnOSPlatform(posixpath.join(url + "lib", 
                                                  _os["name"])) for
                     _os in SvnRepo(url).list(extended = True, rel_path = "lib") if
-                    any([_os["name"].startswith(x) for x in ["android",
-                                                             "darwin", "linux",
-                                                             "win"]])]
+                    _os["name"].startswith(PLATFORM_LIB_DIR_PREFIXES)]
 
-            for _os in _oss:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=SVN_WORKERS) as executor:
 
-                results[_os.svn_name] = _os.python_versions()
+                results = dict(zip([_os.svn_name for _os in _oss],
+                                   executor.map(SvnOSPlatform.python_versions,
+                                                _oss)))
 
         except SvnException: # This can happen when the "lib" path does not exist
 
@@ -350,7 +597,30 @@ class BlenderSvn(SourceVersionControl):
             full_path {pathlib.Path} -- place to put svn sources
         """
 
-        self.repo.checkout(str(full_path))
+        # Exported files carry no `.svn` administrative copy; since there is
+        # then no working copy to update, note which tag is already there.
+        # `full_path` is usually the Blender `git` tree, so the note goes in
+        # the untracked "lib" directory rather than its root
+        marker_path = pathlib.Path(full_path) / "lib" / self.EXPORT_MARKER
+
+        try:
+
+            if marker_path.read_text() == self.url:
+
+                return
+
+        except OSError:
+
+            pass
+
+        # Unquieted, `svn` lists every exported file, all of which the client
+        # collects in memory
+        self.repo.run_command("export", [self.url, str(full_path), "--force",
+                                         "--quiet"])
+
+        marker_path.parent.mkdir(exist_ok=True)
+
+        marker_path.write_text(self.url)
 
 def git_tags() -> List[BlenderGit]:
 
@@ -360,9 +630,12 @@ def svn_tags() -> List[BlenderSvn]:
 
     return [BlenderSvn(tag_full_path) for tag_full_path in BlenderSvn.tags()]
 
+@functools.lru_cache(maxsize=1)
 def get_matched_versions() -> Dict[int, Tuple[List[BlenderGit], 
                                               List[BlenderSvn]]]:
     """Get pairs of sources based on available versions
+
+    Only looked up once per process; do not modify the returned dict
     
     Returns:
         Dict[int, Tuple[List[BlenderGit],List[BlenderSvn]]]
@@ -370,17 +643,17 @@ def get_matched_versions() -> Dict[int, Tuple[List[BlenderGit],
             `BlenderSvn` objects
     """
 
-    result = {}
+    result = collections.defaultdict(lambda: ([], []))
 
-    gits = git_tags()
-    svns = svn_tags()
+    for _git in git_tags():
 
-    for version in set([_svc.version for _svc in gits+svns]):
+        result[_git.version][0].append(_git)
 
-        result[version] = ([_git for _git in gits if _git.version == version],
-                           [_svn for _svn in svns if _svn.version == version])
+    for _svn in svn_tags():
 
-    return result
+        result[_svn.version][1].append(_svn)
+
+    return dict(result)
 
 def get_compatible_sources():
 
@@ -390,31 +663,80 @@ def get_compatible_sources():
 
     compatible_sources = {}
 
+    host_os = SYSTEM.casefold()
+
+    host_python_version = sys.version_info[:2]
+
     matched_version_dict = get_matched_versions()
 
-    for version in [_version for _version in matched_version_dict if 
-                    matched_version_dict[_version][0] and 
-                    matched_version_dict[_version][1]]:
+    versions = [_version for _version in matched_version_dict if 
+                matched_version_dict[_version][0] and 
+                matched_version_dict[_version][1]]
+
+    # Every listing below is a separate `svn` round trip; overlap them
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SVN_WORKERS) as executor:
+
+        versions_platforms = executor.map(BlenderSvn.platforms, 
+                                          [matched_version_dict[version][1][0]
+                                           for version in versions])
 
-        for _platform in matched_version_dict[version][1][0].platforms():
+        candidates = []
 
-            if _platform.os_name is not None and\
-               _platform.os_name.casefold() != platform.system().casefold():
+        for version, platforms in zip(versions, versions_platforms):
 
-                continue
+            for _platform in platforms:
 
-            if _platform.bitness is not None and _platform.bitness != BITNESS:
+                if _platform.os_name is not None and\
+                   _platform.os_name.casefold() != host_os:
 
-                continue
+                    continue
 
-            platform_python_versions = _platform.python_versions()
+                if _platform.bitness is not None and _platform.bitness != BITNESS:
 
-            if sys.version_info[:2] in platform_python_versions:
+                    continue
+
+                candidates.append((version, _platform))
+
+        platforms_python_versions = executor.map(SvnOSPlatform.python_versions,
+                                                 [_platform for _, _platform in
+                                                  candidates])
+
+        for (version, _), platform_python_versions in zip(candidates, 
+                                                         platforms_python_versions):
+
+            if host_python_version in platform_python_versions:
 
                 compatible_sources[version] = matched_version_dict[version]
 
     return compatible_sources
 
+def checkout_sources(path: pathlib.Path, gits: List[BlenderGit],
+                     svns: List[BlenderSvn]):
+    """Get the `git` sources and, if there are any, the `svn` libraries
+
+    The Blender tree comes first; its submodules and the `svn` libraries are
+    then fetched at the same time since they come from different servers
+
+    Arguments:
+        path {pathlib.Path} -- the path to check out to
+        gits {List[BlenderGit]} -- `git` sources for one version
+        svns {List[BlenderSvn]} -- `svn` sources for the same version
+    """
+
+    gits[0].checkout(path, submodules=False)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+
+        futures = [executor.submit(gits[0].checkout_submodules, path)]
+
+        if svns:
+
+            futures.append(executor.submit(svns[0].checkout, path))
+
+        for future in futures:
+
+            future.result()
+
 def checkout_version(path:pathlib.Path, version: str, makedirs: bool = False):
     """Get all the Blender sources for a specific version
     
@@ -432,20 +754,11 @@ def checkout_version(path:pathlib.Path, version: str, makedirs: bool = False):
 
     if version in version_dict:
 
-        if makedirs:
+        path = pathlib.Path(path)
 
-            os.makedirs(path, exist_ok=True)
+        path.mkdir(parents=makedirs, exist_ok=makedirs)
 
-        else:
-
-            os.mkdir(path)
-
-        # Checkout `git` sources
-        version_dict[version][0][0].checkout(path)
-
-        if len(version_dict[version]) == 2:
-            # Checkout `svn` sources
-            version_dict[version][1][0].checkout(path)
+        checkout_sources(path, *version_dict[version])
 
     else:
 
@@ -460,21 +773,20 @@ def checkout_all(path: pathlib.Path, makedirs: bool = False):
         makedirs {bool} -- Automatically create the checkout directory
     """
 
-    for version, vcs in get_matched_versions().items():
+    # Versions are independent of each other; a few at a time keeps the
+    # servers from throttling us
+    with concurrent.futures.ThreadPoolExecutor(max_workers=CHECKOUT_WORKERS) as executor:
 
-        version_dir = os.path.join(path, str(version))
+        futures = []
 
-        if makedirs:
+        for version, vcs in get_matched_versions().items():
 
-            os.makedirs(version_dir, exist_ok=True)
+            version_dir = pathlib.Path(path) / str(version)
 
-        else:
+            version_dir.mkdir(parents=makedirs, exist_ok=makedirs)
 
-            os.mkdir(version_dir)
+            futures.append(executor.submit(checkout_sources, version_dir, *vcs))
 
-        # Checkout `git` sources
-        vcs[0][0].checkout(version_dir)
+        for future in futures:
 
-        if len(vcs) == 2:
-            # Checkout `svn` sources
-            vcs[1][0].checkout(path)
+            future.result()
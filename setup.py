@@ -40,7 +40,6 @@ setup(name='bpy-build',
       author_email='gubalatyler@gmail.com',
       license='GPL-3.0',
       python_requires=">=3.4.0",
-      install_requires=["cmake>=3.13.5", "cmake-generators", "GitPython", "svn",
-                        "distro"],
+      install_requires=["cmake>=3.13.5", "cmake-generators", "svn"],
       url="https://github.com/TylerGubala/bpy-build"
      )
@@ -0,0 +1,426 @@
+"""Tests for the commands `bpybuild.make` generates; nothing is run
+"""
+
+import json
+import pathlib
+import sys
+import unittest
+from typing import List
+from unittest import mock
+
+from bpybuild import make
+
+SOURCE = pathlib.Path("blender")
+BUILD = pathlib.Path("build")
+
+class ConfigureCommandsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        patchers = [mock.patch.object(make, "SYSTEM", "Linux"),
+                    mock.patch.object(make, "_compiler_launcher",
+                                      return_value=None)]
+
+        for patcher in patchers:
+
+            patcher.start()
+
+            self.addCleanup(patcher.stop)
+
+    def configure(self, **kwargs):
+
+        commands = make.get_configure_commands(SOURCE, BUILD, **kwargs)
+
+        self.assertEqual(len(commands), 1)
+
+        return commands[0]
+
+    def test_defaults(self):
+
+        self.assertEqual(self.configure(),
+                         ["cmake", "-DWITH_PYTHON_INSTALL=OFF",
+                          "-DWITH_PYTHON_MODULE=ON",
+                          "-DCMAKE_BUILD_TYPE=Release",
+                          "-S" + str(SOURCE.resolve()),
+                          "-B" + str(BUILD.resolve())])
+
+    def test_caller_args_come_before_os_args(self):
+
+        with mock.patch.object(make, "SYSTEM", "Darwin"):
+
+            command = self.configure(cmake_configure_args=["-DFOO=ON"])
+
+        self.assertEqual(command[4:7], ["-DFOO=ON", "-DWITH_OPENMP=OFF",
+                                        "-DWITH_AUDASPACE=OFF"])
+
+    def test_debug(self):
+
+        self.assertIn("-DCMAKE_BUILD_TYPE=Debug",
+                      self.configure(is_release=False))
+
+    def test_native(self):
+
+        command = self.configure(native=True)
+
+        # Added to, rather than replacing, any exported CFLAGS/CXXFLAGS
+        for arg in ["-DCMAKE_C_FLAGS_INIT=-march=native",
+                    "-DCMAKE_CXX_FLAGS_INIT=-march=native"]:
+
+            self.assertIn(arg, command)
+
+        self.assertNotIn("-DCMAKE_INTERPROCEDURAL_OPTIMIZATION=ON", command)
+
+    def test_ipo(self):
+
+        self.assertNotIn("-DCMAKE_INTERPROCEDURAL_OPTIMIZATION=ON",
+                         self.configure())
+
+        command = self.configure(ipo=True)
+
+        self.assertIn("-DCMAKE_INTERPROCEDURAL_OPTIMIZATION=ON", command)
+        self.assertFalse([arg for arg in command if "-march" in arg])
+
+    def test_compiler_launcher(self):
+
+        make._compiler_launcher.return_value = "ccache"
+
+        command = self.configure(cmake_configure_args=["-DFOO=ON"])
+
+        for arg in ["-DCMAKE_C_COMPILER_LAUNCHER=ccache",
+                    "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache",
+                    "-DCMAKE_CUDA_COMPILER_LAUNCHER=ccache"]:
+
+            self.assertLess(command.index(arg), command.index("-DFOO=ON"))
+
+    def test_without_compiler_cache(self):
+
+        make._compiler_launcher.return_value = "ccache"
+
+        self.assertFalse([arg for arg in
+                          self.configure(use_compiler_cache=False) if
+                          "COMPILER_LAUNCHER" in arg])
+
+    def test_minimal(self):
+
+        self.assertNotIn("-DWITH_CYCLES=OFF", self.configure())
+
+        command = self.configure(minimal=True,
+                                 cmake_configure_args=["-DWITH_CYCLES=ON"])
+
+        # Callers can turn single features back on
+        self.assertLess(command.index("-DWITH_CYCLES=OFF"),
+                        command.index("-DWITH_CYCLES=ON"))
+
+        for arg in make.MINIMAL_CONFIGURE_ARGS:
+
+            self.assertIn(arg, command)
+
+    def test_paths_are_resolved(self):
+
+        command = self.configure()
+
+        self.assertEqual(command[-2:], ["-S" + str(SOURCE.resolve()),
+                                        "-B" + str(BUILD.resolve())])
+
+    def test_ninja_is_opt_in(self):
+
+        self.assertNotIn("Ninja", self.configure())
+
+        command = self.configure(use_ninja=True)
+
+        self.assertEqual(command[command.index("-G") + 1], "Ninja")
+
+    def test_windows_ignores_ninja(self):
+
+        with mock.patch.object(make, "SYSTEM", "Windows"), \
+             mock.patch.object(make, "_vs_generator_options",
+                               return_value={64: "VS x64", 32: "VS Win32"}):
+
+            command = self.configure(bitness=64, use_ninja=True)
+
+        self.assertEqual(command[command.index("-G") + 1], "VS x64")
+
+    def test_windows_visual_studio_generator(self):
+
+        with mock.patch.object(make, "SYSTEM", "Windows"), \
+             mock.patch.object(make, "_vs_generator_options",
+                               return_value={64: "VS x64", 32: "VS Win32"}):
+
+            command_64 = self.configure(bitness=64)
+            command_32 = self.configure(bitness=32)
+
+        self.assertEqual(command_64[command_64.index("-G") + 1], "VS x64")
+        self.assertEqual(command_32[command_32.index("-G") + 1], "VS Win32")
+        self.assertIn("-DWITH_WINDOWS_BUNDLE_CRT=OFF", command_64)
+
+    def test_windows_without_visual_studio(self):
+
+        with mock.patch.object(make, "SYSTEM", "Windows"), \
+             mock.patch.object(make, "_vs_generator_options", return_value={}):
+
+            self.assertRaises(Exception, self.configure)
+
+class VisualStudioGeneratorOptionsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        make._vs_generator_options.cache_clear()
+
+        self.addCleanup(make._vs_generator_options.cache_clear)
+
+    def options(self, *generators):
+
+        with mock.patch.object(make, "_vs_generators",
+                               return_value=tuple(generators)):
+
+            return make._vs_generator_options()
+
+    def test_prefers_64bit_option(self):
+
+        self.assertEqual(self.options(
+            mock.Mock(options=["Visual Studio 16 2019"]),
+            mock.Mock(options=["Visual Studio 15 2017 Win64",
+                               "Visual Studio 15 2017"])),
+            {64: "Visual Studio 15 2017 Win64",
+             32: "Visual Studio 16 2019"})
+
+    def test_falls_back_to_newest(self):
+
+        self.assertEqual(self.options(
+            mock.Mock(options=["Visual Studio 16 2019"])),
+            {64: "Visual Studio 16 2019", 32: "Visual Studio 16 2019"})
+
+    def test_no_visual_studio(self):
+
+        self.assertEqual(self.options(), {})
+
+def generator(name: str) -> mock.Mock:
+    """A stand-in for a `cmakegenerators` generator called `name`
+    """
+
+    _generator = mock.Mock()
+
+    # `name` is taken by `mock.Mock` itself
+    _generator.name = name
+
+    return _generator
+
+class VisualStudioGeneratorsTest(unittest.TestCase):
+
+    GENERATORS = [generator("Unix Makefiles"),
+                  generator("Visual Studio 16 2019"),
+                  generator("Visual Studio 15 2017"),
+                  generator("Visual Studio 14 2015")]
+
+    def setUp(self):
+
+        for cached in [make._installed_vs_versions, make._vs_generators]:
+
+            cached.cache_clear()
+
+            self.addCleanup(cached.cache_clear)
+
+        # `cmakegenerators` is only installed on Windows
+        patcher = mock.patch.dict(sys.modules, cmakegenerators=mock.Mock(
+            get_generators=mock.Mock(return_value=self.GENERATORS)))
+
+        patcher.start()
+
+        self.addCleanup(patcher.stop)
+
+    def vswhere(self, *versions: str):
+        """Patch in a `vswhere` that reports `versions` as installed
+        """
+
+        installs = json.dumps([{"installationVersion": version} for version
+                               in versions]).encode("utf-8")
+
+        patchers = [mock.patch.object(make.os.path, "isfile",
+                                      return_value=True),
+                    mock.patch.object(make.subprocess, "run",
+                                      return_value=mock.Mock(stdout=installs))]
+
+        for patcher in patchers:
+
+            patcher.start()
+
+            self.addCleanup(patcher.stop)
+
+    def names(self) -> List[str]:
+
+        return [_generator.name for _generator in make._vs_generators()]
+
+    def test_installed_versions(self):
+
+        self.vswhere("16.4.29613.14", "15.9.28307.1000")
+
+        self.assertEqual(make._installed_vs_versions(), {15, 16})
+
+    def test_keeps_installed_generators(self):
+
+        self.vswhere("15.9.28307.1000")
+
+        self.assertEqual(self.names(), ["Visual Studio 15 2017"])
+
+    def test_without_vswhere(self):
+
+        with mock.patch.object(make.os.path, "isfile", return_value=False):
+
+            self.assertIsNone(make._installed_vs_versions())
+            self.assertEqual(self.names(), ["Visual Studio 16 2019",
+                                            "Visual Studio 15 2017",
+                                            "Visual Studio 14 2015"])
+
+    def test_nothing_installed_matches(self):
+
+        # e.g. a newer Visual Studio than this cmake knows about
+        self.vswhere("17.0.31903.59")
+
+        self.assertEqual(self.names(), ["Visual Studio 16 2019",
+                                        "Visual Studio 15 2017",
+                                        "Visual Studio 14 2015"])
+
+    def test_unreadable_vswhere_output(self):
+
+        with mock.patch.object(make.os.path, "isfile", return_value=True), \
+             mock.patch.object(make.subprocess, "run",
+                               return_value=mock.Mock(stdout=b"oops")):
+
+            self.assertIsNone(make._installed_vs_versions())
+
+    def test_vswhere_fails_to_start(self):
+
+        with mock.patch.object(make.os.path, "isfile", return_value=True), \
+             mock.patch.object(make.subprocess, "run",
+                               side_effect=PermissionError):
+
+            self.assertIsNone(make._installed_vs_versions())
+            self.assertEqual(len(make._vs_generators()), 3)
+
+class CompilerLauncherTest(unittest.TestCase):
+
+    def setUp(self):
+
+        make._compiler_launcher.cache_clear()
+
+        self.addCleanup(make._compiler_launcher.cache_clear)
+
+    def launcher(self, *on_path):
+
+        with mock.patch.object(make.shutil, "which", side_effect=lambda name:
+                               f"/usr/bin/{name}" if name in on_path else None):
+
+            return make._compiler_launcher()
+
+    def test_prefers_ccache(self):
+
+        self.assertEqual(self.launcher("ccache", "sccache"), "ccache")
+        make._compiler_launcher.cache_clear()
+        self.assertEqual(self.launcher("sccache"), "sccache")
+
+    def test_none_on_path(self):
+
+        self.assertIsNone(self.launcher())
+
+class BuildCommandsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        patcher = mock.patch.object(make, "effective_cpu_count",
+                                    return_value=3)
+
+        patcher.start()
+
+        self.addCleanup(patcher.stop)
+
+    def test_make(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"):
+
+            self.assertEqual(make.get_build_commands(BUILD),
+                             [["make", "-C", str(BUILD.resolve()), "-j3",
+                               "install"]])
+
+    def test_ninja(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"):
+
+            self.assertEqual(make.get_build_commands(BUILD, use_ninja=True),
+                             [["cmake", "--build", str(BUILD.resolve()),
+                               "--target", "install", "--parallel", "3"]])
+
+    def test_windows(self):
+
+        with mock.patch.object(make, "SYSTEM", "Windows"):
+
+            command, = make.get_build_commands(BUILD, is_release=False)
+
+        self.assertEqual(command, ["cmake", "--build", str(BUILD.resolve()),
+                                   "--target", "INSTALL", "--config", "Debug",
+                                   "--parallel", "3", "--",
+                                   "/nodeReuse:false",
+                                   "/p:UseMultiToolTask=true",
+                                   "/p:EnforceProcessCountAcrossBuilds=true"])
+
+    def test_jobs(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"):
+
+            self.assertEqual(make.get_build_commands(BUILD, jobs=5),
+                             [["make", "-C", str(BUILD.resolve()), "-j5",
+                               "install"]])
+
+    def test_jobs_default_to_cpu_count(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"):
+
+            self.assertIn("-j3", make.get_build_commands(BUILD, jobs=None)[0])
+
+class MakeCommandsTest(unittest.TestCase):
+
+    def test_build_location_defaults_to_source(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"), \
+             mock.patch.object(make, "_compiler_launcher", return_value=None):
+
+            configure, build = make.get_make_commands(SOURCE)
+
+        self.assertIn("-B" + str(SOURCE.resolve()), configure)
+        self.assertIn(str(SOURCE.resolve()), build)
+
+    def test_ninja_reaches_both_steps(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"), \
+             mock.patch.object(make, "_compiler_launcher", return_value=None):
+
+            configure, build = make.get_make_commands(SOURCE, use_ninja=True)
+
+        self.assertIn("Ninja", configure)
+        self.assertEqual(build[:2], ["cmake", "--build"])
+
+    def test_options_reach_both_steps(self):
+
+        with mock.patch.object(make, "SYSTEM", "Linux"), \
+             mock.patch.object(make, "_compiler_launcher",
+                               return_value="ccache"):
+
+            configure, build = make.get_make_commands(
+                SOURCE, BUILD, is_release=False, jobs=5,
+                use_compiler_cache=False, minimal=True, native=True,
+                use_ninja=True, ipo=True)
+
+        for arg in ("-DCMAKE_BUILD_TYPE=Debug",
+                    "-DCMAKE_INTERPROCEDURAL_OPTIMIZATION=ON",
+                    "-DCMAKE_C_FLAGS_INIT=-march=native", "Ninja") + \
+                   make.MINIMAL_CONFIGURE_ARGS:
+
+            self.assertIn(arg, configure)
+
+        self.assertFalse([arg for arg in configure if
+                          "COMPILER_LAUNCHER" in arg])
+        self.assertEqual(build, ["cmake", "--build", str(BUILD.resolve()),
+                                 "--target", "install", "--parallel", "5"])
+
+if __name__ == "__main__":
+
+    unittest.main()
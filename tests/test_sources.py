@@ -0,0 +1,444 @@
+"""Offline tests for `bpybuild.sources`; `git` only ever talks to a local
+repository
+"""
+
+import os
+import pathlib
+import subprocess
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pkg_resources
+
+from bpybuild import sources
+
+GIT_ENV = dict(os.environ, GIT_AUTHOR_NAME="bpybuild",
+               GIT_AUTHOR_EMAIL="bpybuild@example.com",
+               GIT_COMMITTER_NAME="bpybuild",
+               GIT_COMMITTER_EMAIL="bpybuild@example.com")
+
+class BlenderGitCheckoutTest(unittest.TestCase):
+
+    def setUp(self):
+
+        temp_dir = tempfile.TemporaryDirectory()
+
+        self.addCleanup(temp_dir.cleanup)
+
+        self.origin = pathlib.Path(temp_dir.name) / "origin"
+        self.clone = pathlib.Path(temp_dir.name) / "clone"
+
+        self.git(self.origin.parent, "init", "--quiet", str(self.origin))
+
+        self.commit_and_tag("2.80")
+
+        # Shallow clones need a `file://` url rather than a plain path
+        patchers = [mock.patch.object(sources.BlenderGit, "BASE_URL",
+                                      self.origin.as_uri()),
+                    mock.patch.object(sources, "CACHE_DIR",
+                                      pathlib.Path(temp_dir.name) / "cache")]
+
+        for patcher in patchers:
+
+            patcher.start()
+
+            self.addCleanup(patcher.stop)
+
+        self.forget_remote_tags()
+
+        self.addCleanup(self.forget_remote_tags)
+
+    def git(self, path: pathlib.Path, *args: str) -> str:
+
+        return subprocess.run(("git", "-C", str(path)) + args, check=True,
+                              stdout=subprocess.PIPE, universal_newlines=True,
+                              env=GIT_ENV).stdout.strip()
+
+    def forget_remote_tags(self):
+
+        sources.git_remote_tags.cache_clear()
+
+        for cache_path in sources.CACHE_DIR.glob("git_remote_tags/*.json"):
+
+            cache_path.unlink()
+
+    def commit_and_tag(self, tag: str) -> str:
+
+        self.git(self.origin, "commit", "--quiet", "--allow-empty",
+                 "-m", tag)
+        self.git(self.origin, "tag", "--force", tag)
+
+        self.forget_remote_tags()
+
+        return self.git(self.origin, "rev-parse", "HEAD")
+
+    def head(self) -> str:
+
+        return self.git(self.clone, "rev-parse", "HEAD")
+
+    def test_clone_is_shallow_and_at_tag(self):
+
+        blender_git = sources.BlenderGit("2.80")
+
+        blender_git.checkout(self.clone)
+
+        self.assertEqual(self.head(),
+                         self.git(self.origin, "rev-parse", "2.80"))
+        self.assertEqual(self.git(self.clone, "rev-parse",
+                                  "--is-shallow-repository"), "true")
+        self.assertTrue(blender_git.is_checked_out(self.clone))
+
+    def test_fetches_new_tag_into_existing_clone(self):
+
+        sources.BlenderGit("2.80").checkout(self.clone)
+
+        sha = self.commit_and_tag("2.81")
+
+        blender_git = sources.BlenderGit("2.81")
+
+        self.assertFalse(blender_git.is_checked_out(self.clone))
+        self.assertFalse(blender_git.has_current_tag(self.clone))
+
+        blender_git.checkout(self.clone)
+
+        self.assertEqual(self.head(), sha)
+        self.assertEqual(self.git(self.clone, "rev-parse",
+                                  "--is-shallow-repository"), "true")
+        self.assertTrue(blender_git.is_checked_out(self.clone))
+        self.assertTrue(blender_git.has_current_tag(self.clone))
+
+    def test_resets_to_tag_already_in_clone(self):
+
+        sha = self.git(self.origin, "rev-parse", "2.80")
+
+        sources.BlenderGit("2.80").checkout(self.clone)
+
+        self.commit_and_tag("2.81")
+
+        sources.BlenderGit("2.81").checkout(self.clone)
+
+        with mock.patch.object(sources, "run_git",
+                               wraps=sources.run_git) as run_git:
+
+            sources.BlenderGit("2.80").checkout(self.clone, submodules=False)
+
+        self.assertEqual(self.head(), sha)
+        self.assertNotIn("fetch", {arg for call in run_git.call_args_list for
+                                   arg in call[0]})
+
+    def test_refetches_moved_tag(self):
+
+        sources.BlenderGit("2.80").checkout(self.clone, submodules=False)
+
+        sha = self.commit_and_tag("2.80")
+
+        blender_git = sources.BlenderGit("2.80")
+
+        # Still at the local tag, which the remote no longer agrees with
+        self.assertTrue(blender_git.is_checked_out(self.clone))
+        self.assertFalse(blender_git.has_current_tag(self.clone))
+
+        blender_git.checkout(self.clone, submodules=False)
+
+        self.assertEqual(self.head(), sha)
+        self.assertTrue(blender_git.has_current_tag(self.clone))
+
+    def test_skips_clone_already_at_tag(self):
+
+        sources.BlenderGit("2.80").checkout(self.clone)
+
+        with mock.patch.object(sources, "run_git",
+                               wraps=sources.run_git) as run_git:
+
+            sources.BlenderGit("2.80").checkout(self.clone, submodules=False)
+
+        self.assertFalse({"fetch", "reset"} & {arg for call in 
+                                               run_git.call_args_list for 
+                                               arg in call[0]})
+
+    def test_not_checked_out_without_clone(self):
+
+        self.assertFalse(sources.BlenderGit("2.80").is_checked_out(self.clone))
+
+class SvnOSPlatformTest(unittest.TestCase):
+
+    # `svn` directory name, then os, os version, processor, bitness and
+    # build environment
+    PLATFORMS = [("win64_vc15", "Windows", None, None, 64, "vc15"),
+                 ("win32_vc14", "Windows", None, None, 32, "vc14"),
+                 ("windows", "Windows", None, None, 32, None),
+                 ("darwin-9.x.universal", "Darwin", "9.x", "universal", None,
+                  None),
+                 ("darwin-13.0.x86_64", "Darwin", "13.0", "x86_64", None,
+                  None),
+                 ("darwin", "Darwin", None, None, None, None),
+                 ("linux-glibc217-x86_64", "Linux", None, None, None, None),
+                 ("android", "Android", None, None, None, None),
+                 ("benchmarks", None, None, None, None, None)]
+
+    def test_platform_names(self):
+
+        for svn_name, *expected in self.PLATFORMS:
+
+            with self.subTest(svn_name=svn_name):
+
+                _platform = sources.SvnOSPlatform(
+                    "https://svn.example.com/lib/" + svn_name)
+
+                self.assertEqual(_platform.svn_name, svn_name)
+                self.assertEqual([_platform.os_name,
+                                  None if _platform.os_version is None else
+                                  str(_platform.os_version),
+                                  _platform.processor, _platform.bitness,
+                                  _platform.build_environment], expected)
+
+class BlenderSvnVersionTest(unittest.TestCase):
+
+    def version(self, tag: str):
+
+        return sources.BlenderSvn(
+            "https://svn.example.com/bf-blender/tags/" + tag).version
+
+    def test_release_tag(self):
+
+        self.assertEqual(self.version("blender-2.80-release/"),
+                         pkg_resources.parse_version("2.80"))
+
+    def test_winfix_tag(self):
+
+        self.assertEqual(self.version("blender-2.79-winfix"),
+                         pkg_resources.parse_version("2.79"))
+
+    def test_version_does_not_need_svn(self):
+
+        blender_svn = sources.BlenderSvn(
+            "https://svn.example.com/bf-blender/tags/blender-2.83-release")
+
+        self.assertEqual(blender_svn.version,
+                         pkg_resources.parse_version("2.83"))
+        self.assertIsNone(blender_svn._repo)
+
+class MatchedVersionsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        sources.get_matched_versions.cache_clear()
+
+        self.addCleanup(sources.get_matched_versions.cache_clear)
+
+    def test_buckets_tags_by_version(self):
+
+        git_280, git_281 = (sources.BlenderGit(tag) for tag in
+                            ["v2.80", "v2.81"])
+
+        svn_280, svn_280_winfix, svn_279 = (
+            sources.BlenderSvn("https://svn.example.com/tags/" + tag) for tag
+            in ["blender-2.80-release", "blender-2.80-winfix",
+                "blender-2.79-release"])
+
+        with mock.patch.object(sources, "git_tags",
+                               return_value=[git_280, git_281]), \
+             mock.patch.object(sources, "svn_tags",
+                               return_value=[svn_280, svn_280_winfix,
+                                             svn_279]):
+
+            matched = sources.get_matched_versions()
+
+        self.assertEqual(matched, {
+            pkg_resources.parse_version("2.80"): ([git_280],
+                                                  [svn_280, svn_280_winfix]),
+            pkg_resources.parse_version("2.81"): ([git_281], []),
+            pkg_resources.parse_version("2.79"): ([], [svn_279])})
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        temp_dir = tempfile.TemporaryDirectory()
+
+        self.addCleanup(temp_dir.cleanup)
+
+        self.cache_dir = pathlib.Path(temp_dir.name) / "cache"
+
+    def age(self, path: pathlib.Path, seconds: float):
+
+        mtime = time.time() - seconds
+
+        os.utime(str(path), (mtime, mtime))
+
+    def test_round_trip(self):
+
+        cache_path = self.cache_dir / "nested" / "data.json"
+
+        sources.write_cache(cache_path, {"tags": ["2.80"]})
+
+        self.assertEqual(sources.read_cache(cache_path), {"tags": ["2.80"]})
+
+    def test_missing(self):
+
+        self.assertIsNone(sources.read_cache(self.cache_dir / "data.json"))
+
+    def test_max_age(self):
+
+        cache_path = self.cache_dir / "data.json"
+
+        sources.write_cache(cache_path, [1])
+
+        self.age(cache_path, 30)
+
+        self.assertEqual(sources.read_cache(cache_path, max_age=60), [1])
+        self.assertIsNone(sources.read_cache(cache_path, max_age=10))
+        self.assertEqual(sources.read_cache(cache_path), [1])
+
+    def test_git_remote_tags_round_trip(self):
+
+        ls_remote = ("1111\trefs/tags/v2.80\n"
+                     "2222\trefs/tags/v2.80^{}\n"
+                     "3333\trefs/tags/v2.81\n")
+
+        expected = [("1111", "refs/tags/v2.80"), ("3333", "refs/tags/v2.81")]
+
+        sources.git_remote_tags.cache_clear()
+
+        self.addCleanup(sources.git_remote_tags.cache_clear)
+
+        with mock.patch.object(sources, "CACHE_DIR", self.cache_dir), \
+             mock.patch.object(sources, "run_git",
+                               return_value=ls_remote) as run_git:
+
+            self.assertEqual(sources.git_remote_tags("url"), expected)
+
+            # A new process only has what is on disk
+            sources.git_remote_tags.cache_clear()
+
+            self.assertEqual(sources.git_remote_tags("url"), expected)
+            self.assertEqual(run_git.call_count, 1)
+
+            cache_path, = self.cache_dir.glob("git_remote_tags/*.json")
+
+            self.age(cache_path, sources.GIT_TAGS_CACHE_SECONDS + 1)
+
+            sources.git_remote_tags.cache_clear()
+
+            self.assertEqual(sources.git_remote_tags("url"), expected)
+            self.assertEqual(run_git.call_count, 2)
+
+class DefaultCacheDirTest(unittest.TestCase):
+
+    def cache_dir(self, system: str = "Linux", **environ: str):
+
+        with mock.patch.object(sources, "SYSTEM", system), \
+             mock.patch.dict(os.environ, environ):
+
+            for name in {"BPYBUILD_CACHE_DIR", "XDG_CACHE_HOME",
+                         "LOCALAPPDATA"} - set(environ):
+
+                os.environ.pop(name, None)
+
+            return sources.default_cache_dir()
+
+    def test_override(self):
+
+        self.assertEqual(self.cache_dir(BPYBUILD_CACHE_DIR="/tmp/bpy",
+                                        XDG_CACHE_HOME="/xdg"),
+                         pathlib.Path("/tmp/bpy"))
+
+    def test_empty_override_disables(self):
+
+        self.assertIsNone(self.cache_dir(BPYBUILD_CACHE_DIR=""))
+
+    def test_xdg(self):
+
+        self.assertEqual(self.cache_dir(XDG_CACHE_HOME="/xdg"),
+                         pathlib.Path("/xdg", "bpybuild"))
+        self.assertEqual(self.cache_dir(),
+                         pathlib.Path.home() / ".cache" / "bpybuild")
+
+    def test_windows(self):
+
+        self.assertEqual(self.cache_dir("Windows", LOCALAPPDATA="/local"),
+                         pathlib.Path("/local", "bpybuild"))
+
+    def test_darwin(self):
+
+        self.assertEqual(self.cache_dir("Darwin", XDG_CACHE_HOME="/xdg"),
+                         pathlib.Path.home() / "Library" / "Caches" /
+                         "bpybuild")
+
+    def test_git_remote_tags_without_cache_dir(self):
+
+        sources.git_remote_tags.cache_clear()
+
+        self.addCleanup(sources.git_remote_tags.cache_clear)
+
+        with mock.patch.object(sources, "CACHE_DIR", None), \
+             mock.patch.object(sources, "write_cache") as write_cache, \
+             mock.patch.object(sources, "run_git",
+                               return_value="1111\trefs/tags/v2.80\n"):
+
+            self.assertEqual(sources.git_remote_tags("url"),
+                             [("1111", "refs/tags/v2.80")])
+
+        write_cache.assert_not_called()
+
+class BlenderSvnCheckoutTest(unittest.TestCase):
+
+    TAGS_URL = "https://svn.example.com/bf-blender/tags/"
+
+    def setUp(self):
+
+        temp_dir = tempfile.TemporaryDirectory()
+
+        self.addCleanup(temp_dir.cleanup)
+
+        self.path = pathlib.Path(temp_dir.name) / "svn"
+
+        # The libraries usually land in the Blender `git` tree
+        self.marker_path = self.path / "lib" / sources.BlenderSvn.EXPORT_MARKER
+
+    def checkout(self, tag: str) -> mock.Mock:
+        """Check out `tag` with a stand-in `svn` client, returning it
+        """
+
+        blender_svn = sources.BlenderSvn(self.TAGS_URL + tag)
+
+        blender_svn._repo = mock.Mock()
+
+        # `svn export` creates the destination itself
+        blender_svn._repo.run_command.side_effect = \
+            lambda *args: self.path.mkdir(parents=True, exist_ok=True)
+
+        blender_svn.checkout(self.path)
+
+        return blender_svn._repo
+
+    def test_exports_and_writes_marker(self):
+
+        repo = self.checkout("blender-2.80-release")
+
+        repo.run_command.assert_called_once_with(
+            "export", [self.TAGS_URL + "blender-2.80-release", str(self.path),
+                       "--force", "--quiet"])
+        self.assertEqual(self.marker_path.read_text(),
+                         self.TAGS_URL + "blender-2.80-release")
+        self.assertEqual([path.name for path in self.path.iterdir()], ["lib"])
+
+    def test_matching_marker_skips_export(self):
+
+        self.checkout("blender-2.80-release")
+
+        self.checkout("blender-2.80-release").run_command.assert_not_called()
+
+    def test_other_tag_exports_again(self):
+
+        self.checkout("blender-2.80-release")
+
+        self.checkout("blender-2.81-release").run_command.assert_called_once()
+        self.assertEqual(self.marker_path.read_text(),
+                         self.TAGS_URL + "blender-2.81-release")
+
+if __name__ == "__main__":
+
+    unittest.main()